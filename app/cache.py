@@ -1,56 +1,97 @@
 import time
 import threading
-from typing import Dict, Optional, Any
-from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Any, Tuple
 
 
 class TTLCache:
+    # Number of independent shards; must be a power of two
+    NUM_SHARDS = 16
+    # Oldest entries inspected per opportunistic expiry sweep
+    SWEEP_BATCH = 32
+
     def __init__(self, max_size: int = 512, ttl_seconds: int = 600):
         self.max_size = max_size
         self.ttl_seconds = ttl_seconds
-        self.cache: OrderedDict[str, Tuple[Any, float]] = OrderedDict()
-        self.lock = threading.Lock()
-    
-    def get(self, key: str) -> Optional[Any]:
+        # Monotonic clock so NTP adjustments can't expire or revive entries
+        self._now = time.monotonic
+        # Sweep expired entries every Nth set
+        self._ops = 0
+        self._sweep_every = 64
+        # Each shard has its own lock so concurrent requests only contend
+        # when their keys land in the same shard
+        self._shard_max_size = max(1, max_size // self.NUM_SHARDS)
+        self._shards: List[Tuple[threading.Lock, Dict[Hashable, Tuple[Any, float]]]] = [
+            (threading.Lock(), {}) for _ in range(self.NUM_SHARDS)
+        ]
+
+    def _shard(self, key: Hashable) -> Tuple[threading.Lock, Dict[Hashable, Tuple[Any, float]]]:
+        """Get the shard responsible for a key"""
+        return self._shards[hash(key) & (self.NUM_SHARDS - 1)]
+
+    def get(self, key: Hashable) -> Optional[Any]:
         """Get value from cache if not expired"""
-        with self.lock:
-            if key not in self.cache:
+        lock, entries = self._shard(key)
+        with lock:
+            if key not in entries:
                 return None
-            
-            value, timestamp = self.cache[key]
-            
+
+            value, timestamp = entries[key]
+
             # Check if expired
-            if time.time() - timestamp > self.ttl_seconds:
-                del self.cache[key]
+            if self._now() - timestamp > self.ttl_seconds:
+                del entries[key]
                 return None
-            
-            # Move to end (LRU)
-            self.cache.move_to_end(key)
+
+            # Move to end (LRU): dicts keep insertion order, so reinserting
+            # makes this the newest entry
+            entries[key] = entries.pop(key)
             return value
-    
-    def set(self, key: str, value: Any) -> None:
+
+    def set(self, key: Hashable, value: Any) -> None:
         """Set value in cache with TTL"""
-        with self.lock:
+        lock, entries = self._shard(key)
+        with lock:
             # Remove if exists
-            if key in self.cache:
-                del self.cache[key]
-            
+            if key in entries:
+                del entries[key]
+
             # Add new entry
-            self.cache[key] = (value, time.time())
-            
-            # Remove oldest if over limit
-            while len(self.cache) > self.max_size:
-                self.cache.popitem(last=False)
-    
+            now = self._now()
+            entries[key] = (value, now)
+
+            # Remove oldest if over the shard limit
+            while len(entries) > self._shard_max_size:
+                del entries[next(iter(entries))]
+
+            # Shared across shards; a lost increment only delays a sweep
+            self._ops += 1
+            if self._ops % self._sweep_every == 0:
+                self._sweep(entries, now)
+
+    def _sweep(self, entries: Dict[Hashable, Tuple[Any, float]], now: float) -> None:
+        """Drop expired entries from the old end of a shard (caller holds its lock)"""
+        expired = []
+        # Insertion order approximates age order since touched entries are reinserted
+        for key, (_, timestamp) in entries.items():
+            if len(expired) >= self.SWEEP_BATCH or now - timestamp <= self.ttl_seconds:
+                break
+            expired.append(key)
+        for key in expired:
+            del entries[key]
+
     def clear(self) -> None:
         """Clear all cache entries"""
-        with self.lock:
-            self.cache.clear()
-    
+        for lock, entries in self._shards:
+            with lock:
+                entries.clear()
+
     def size(self) -> int:
         """Get current cache size"""
-        with self.lock:
-            return len(self.cache)
+        total = 0
+        for lock, entries in self._shards:
+            with lock:
+                total += len(entries)
+        return total
 
 
 # Global cache instance
@@ -1,6 +1,6 @@
-import os
-from typing import List
-from pydantic_settings import BaseSettings
+from typing import Tuple
+from pydantic import AliasChoices, Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
@@ -12,12 +12,16 @@ class Settings(BaseSettings):
     
     # File handling
     max_file_size_bytes: int = 10 * 1024 * 1024  # 10MB
-    allowed_formats: List[str] = ["jpeg", "jpg", "png", "gif"]
+    allowed_formats: Tuple[str, ...] = ("jpeg", "jpg", "png", "gif")
     
     # Timeouts
     request_timeout_seconds: int = 20
     ocr_timeout_seconds: int = 15
     
+    # OCR
+    ocr_draft_size: int = 2000  # JPEGs are decoded at the smallest scale covering this
+    tesseract_config: str = "--oem 1"  # LSTM engine only
+    
     # Rate limiting
     rate_limit_requests: int = 60
     rate_limit_window_seconds: int = 60
@@ -26,22 +30,10 @@ class Settings(BaseSettings):
     cache_ttl_seconds: int = 600
     cache_max_items: int = 512
     
-    # Deployment
-    port: int = 8080
-    
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        # Handle PORT environment variable for cloud deployment
-        port_env = os.getenv('PORT')
-        if port_env:
-            try:
-                self.port = int(port_env)
-            except ValueError:
-                pass  # Keep default port if PORT is invalid
-    
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
+    # Deployment (cloud platforms provide PORT)
+    port: int = Field(default=8080, validation_alias=AliasChoices("PORT", "port"))
+    
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=False, frozen=True)
 
 
 settings = Settings()
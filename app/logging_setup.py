@@ -1,7 +1,10 @@
+import io
 import logging
-import json
 import sys
-from typing import Any, Dict
+import threading
+import time
+import orjson
+from typing import Any, Dict, Optional, TextIO
 
 
 class JsonFormatter(logging.Formatter):
@@ -15,14 +18,90 @@ class JsonFormatter(logging.Formatter):
             log["exc_info"] = self.formatException(record.exc_info)
         if hasattr(record, "extra") and isinstance(record.extra, dict):
             log.update(record.extra)
-        return json.dumps(log, ensure_ascii=False)
+        # orjson always emits UTF-8; non-str keys in extra are stringified
+        return orjson.dumps(log, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
 
 
-def configure_logging(level: int = logging.INFO) -> None:
-    handler = logging.StreamHandler(sys.stdout)
+class BufferedStreamHandler(logging.StreamHandler):
+    """StreamHandler that coalesces writes instead of flushing every record"""
+
+    def __init__(self, stream: TextIO, flush_every: int = 32):
+        super().__init__(stream)
+        self.flush_every = flush_every
+        self._pending = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            self._pending += 1
+            # Warnings and errors go out immediately
+            if record.levelno >= logging.WARNING or self._pending >= self.flush_every:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            self._pending = 0
+            super().flush()
+        finally:
+            self.release()
+
+
+def _open_buffered_stdout(buffer_size: int = 4096) -> TextIO:
+    """Open a block-buffered writer on stdout's file descriptor"""
+    try:
+        fd = sys.stdout.fileno()
+    except (AttributeError, io.UnsupportedOperation):
+        # stdout has been replaced (e.g. captured under pytest)
+        return sys.stdout
+    return open(fd, "w", buffering=buffer_size, encoding="utf-8", closefd=False)
+
+
+# The handler installed by the latest configure_logging() call; one flush
+# thread serves it, so reconfiguring doesn't start another thread
+_handler: Optional[BufferedStreamHandler] = None
+_flush_interval_seconds = 1.0
+_flush_thread: Optional[threading.Thread] = None
+_flush_lock = threading.Lock()
+
+
+def _periodic_flush() -> None:
+    """Flush the current handler in the background so quiet periods don't hold logs back"""
+    while True:
+        time.sleep(_flush_interval_seconds)
+        with _flush_lock:
+            if _handler is not None:
+                _handler.flush()
+
+
+def _close_handler(handler: BufferedStreamHandler) -> None:
+    """Flush and close a replaced handler, including the stdout writer it opened"""
+    handler.close()
+    if handler.stream is not sys.stdout:
+        # closefd=False, so this flushes the writer without closing fd 1
+        handler.stream.close()
+
+
+def configure_logging(level: int = logging.INFO, flush_interval_seconds: float = 1.0) -> None:
+    global _handler, _flush_interval_seconds, _flush_thread
+    # logging.shutdown() flushes the handler at interpreter exit
+    handler = BufferedStreamHandler(_open_buffered_stdout())
     handler.setFormatter(JsonFormatter())
 
     root = logging.getLogger()
     root.handlers = []
     root.addHandler(handler)
     root.setLevel(level)
+
+    with _flush_lock:
+        previous, _handler = _handler, handler
+        _flush_interval_seconds = flush_interval_seconds
+        if previous is not None:
+            _close_handler(previous)
+        if _flush_thread is None:
+            _flush_thread = threading.Thread(target=_periodic_flush, name="log-flush", daemon=True)
+            _flush_thread.start()
@@ -1,14 +1,19 @@
+import asyncio
+import os
 import time
 import logging
-from typing import List
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO, Dict, List, Tuple
 from fastapi import FastAPI, UploadFile, File, HTTPException, Request  # pyright: ignore[reportMissingImports]
-from fastapi.responses import JSONResponse  # pyright: ignore[reportMissingImports]
+from fastapi.responses import ORJSONResponse  # pyright: ignore[reportMissingImports]
 from fastapi.middleware.cors import CORSMiddleware  # pyright: ignore[reportMissingImports]
+from starlette.concurrency import run_in_threadpool  # pyright: ignore[reportMissingImports]
 
 from .config import settings
 from .models import OCRResponse, OCRErrorResponse, BatchResponse, BatchItemResponse
-from .ocr import ocr_service
-from .utils import validate_image_format, validate_image_magic_bytes, get_image_metadata, calculate_file_hash
+from .ocr import get_ocr_service
+from .utils import validate_image_format, validate_image_magic_bytes, new_file_hasher, file_hash_digest
 from .rate_limit import rate_limiter
 from .cache import cache
 from .logging_setup import configure_logging
@@ -17,11 +22,27 @@ from .logging_setup import configure_logging
 configure_logging()
 logger = logging.getLogger(__name__)
 
+# Upload read size; each chunk is hashed as it is read
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Thread pool for blocking OCR work (Tesseract runs outside the GIL)
+ocr_executor = ThreadPoolExecutor(max_workers=min(10, os.cpu_count() or 1))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the OCR service before serving, so a missing Tesseract fails the deploy"""
+    await run_in_threadpool(get_ocr_service)
+    yield
+
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.app_name,
     description="Extract text from images using Tesseract OCR",
-    version=settings.version
+    version=settings.version,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -60,7 +81,7 @@ async def rate_limit_middleware(request: Request, call_next):
     
     allowed, remaining = rate_limiter.is_allowed(client_ip)
     if not allowed:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=429,
             content={
                 "success": False,
@@ -78,10 +99,110 @@ async def rate_limit_middleware(request: Request, call_next):
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
+    """Health check endpoint; unhealthy while the OCR service can't start"""
+    try:
+        await run_in_threadpool(get_ocr_service)
+    except RuntimeError as e:
+        return ORJSONResponse(
+            status_code=503,
+            content={"status": "unhealthy", "service": "ocr-api", "error": str(e)}
+        )
     return {"status": "healthy", "service": "ocr-api"}
 
 
+def _read_and_hash(file: BinaryIO) -> Tuple[bytearray, bytes]:
+    """Read an upload's spooled file, hashing and enforcing the size limit as we go"""
+    hasher = new_file_hasher()
+    buffer = bytearray()
+    while chunk := file.read(UPLOAD_CHUNK_SIZE):
+        hasher.update(chunk)
+        buffer.extend(chunk)
+        if len(buffer) > settings.max_file_size_bytes:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File too large. Maximum size: {settings.max_file_size_bytes} bytes"
+            )
+    return buffer, file_hash_digest(hasher)
+
+
+async def read_upload(image: UploadFile) -> Tuple[bytearray, bytes]:
+    """Validate an upload's headers, then read and hash its content"""
+    # Validate file
+    if not image.filename:
+        raise HTTPException(status_code=400, detail="No file provided")
+    
+    # Check file size
+    if image.size and image.size > settings.max_file_size_bytes:
+        raise HTTPException(
+            status_code=413, 
+            detail=f"File too large. Maximum size: {settings.max_file_size_bytes} bytes"
+        )
+    
+    # Validate format
+    is_valid, error_msg = validate_image_format(image)
+    if not is_valid:
+        raise HTTPException(status_code=400, detail=error_msg)
+    
+    # Read file content in a single threadpool hop rather than one per chunk
+    return await run_in_threadpool(_read_and_hash, image.file)
+
+
+def process_image(content: bytearray, file_hash: bytes, start_time: float) -> Dict[str, Any]:
+    """
+    Validate, OCR and cache a single image
+    Blocking: run it on ocr_executor so the event loop stays free
+    """
+    # Check cache; keys are content hashes, so a hit was already validated
+    cached_result = cache.get(file_hash)
+    if cached_result:
+        logger.info(f"Cache hit for file hash: {file_hash[:8].hex()}...")
+        result = dict(cached_result)
+        result["cached"] = True
+        result["processing_time_ms"] = int((time.time() - start_time) * 1000)
+        return result
+    
+    # Validate magic bytes
+    is_valid_magic, format_type = validate_image_magic_bytes(content)
+    if not is_valid_magic:
+        raise HTTPException(status_code=400, detail="Invalid image format")
+    
+    # Extract text using OCR (metadata includes the image's own details)
+    text, confidence, metadata = get_ocr_service().extract_text(content)
+    
+    # Calculate processing time
+    processing_time_ms = int((time.time() - start_time) * 1000)
+    
+    # Prepare response
+    result = {
+        "success": True,
+        "text": text,
+        "confidence": confidence,
+        "processing_time_ms": processing_time_ms,
+        "metadata": metadata,
+        "cached": False
+    }
+    
+    # Validate once and cache the serializable form, so hits can skip Pydantic
+    result = OCRResponse(**result).model_dump()
+    cache.set(file_hash, result)
+    return result
+
+
+async def run_ocr(image: UploadFile, start_time: float) -> Dict[str, Any]:
+    """Read an upload and process it on the OCR thread pool"""
+    content, file_hash = await read_upload(image)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(ocr_executor, process_image, content, file_hash, start_time)
+
+
+def log_ocr_completed(client_ip: str, result: Dict[str, Any]) -> None:
+    """Log a freshly processed (not cached) OCR result"""
+    logger.info(
+        f"OCR completed for {client_ip}: {len(result['text'])} chars, "
+        f"{result['processing_time_ms']}ms, confidence: {result['confidence']:.2f}"
+    )
+
+
 @app.post("/extract-text", response_model=OCRResponse)
 async def extract_text(
     request: Request,
@@ -97,82 +218,21 @@ async def extract_text(
     client_ip = get_client_ip(request)
     
     try:
-        # Validate file
-        if not image.filename:
-            raise HTTPException(status_code=400, detail="No file provided")
+        result = await run_ocr(image, start_time)
         
-        # Check file size
-        if image.size and image.size > settings.max_file_size_bytes:
-            raise HTTPException(
-                status_code=413, 
-                detail=f"File too large. Maximum size: {settings.max_file_size_bytes} bytes"
-            )
-        
-        # Validate format
-        is_valid, error_msg = validate_image_format(image)
-        if not is_valid:
-            raise HTTPException(status_code=400, detail=error_msg)
-        
-        # Read file content
-        content = await image.read()
-        
-        # Check actual file size after reading
-        if len(content) > settings.max_file_size_bytes:
-            raise HTTPException(
-                status_code=413,
-                detail=f"File too large. Maximum size: {settings.max_file_size_bytes} bytes"
-            )
-        
-        # Validate magic bytes
-        is_valid_magic, format_type = validate_image_magic_bytes(content)
-        if not is_valid_magic:
-            raise HTTPException(status_code=400, detail="Invalid image format")
-        
-        # Check cache
-        file_hash = calculate_file_hash(content)
-        cached_result = cache.get(file_hash)
-        if cached_result:
-            logger.info(f"Cache hit for file hash: {file_hash[:8]}...")
-            cached_result["cached"] = True
-            cached_result["processing_time_ms"] = int((time.time() - start_time) * 1000)
-            return OCRResponse(**cached_result)
-        
-        # Extract text using OCR
-        text, confidence, metadata = ocr_service.extract_text(content)
-        
-        # Add image metadata
-        image_metadata = get_image_metadata(content)
-        metadata.update(image_metadata)
-        
-        # Calculate processing time
-        processing_time_ms = int((time.time() - start_time) * 1000)
-        
-        # Prepare response
-        result = {
-            "success": True,
-            "text": text,
-            "confidence": confidence,
-            "processing_time_ms": processing_time_ms,
-            "metadata": metadata,
-            "cached": False
-        }
+        # process_image already validated the result against OCRResponse;
+        # returning a Response directly skips FastAPI's response_model pass
+        if not result["cached"]:
+            log_ocr_completed(client_ip, result)
         
-        # Cache the result
-        cache.set(file_hash, result)
-        
-        logger.info(
-            f"OCR completed for {client_ip}: {len(text)} chars, "
-            f"{processing_time_ms}ms, confidence: {confidence:.2f}"
-        )
-        
-        return OCRResponse(**result)
+        return ORJSONResponse(content=result)
         
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Unexpected error in extract_text: {e}", exc_info=True)
         processing_time_ms = int((time.time() - start_time) * 1000)
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={
                 "success": False,
@@ -183,6 +243,38 @@ async def extract_text(
         )
 
 
+def build_batch_item(index: int, image: UploadFile, outcome: Any) -> BatchItemResponse:
+    """Turn one image's result or exception into a batch item"""
+    try:
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return BatchItemResponse(
+            filename=image.filename,
+            # process_image only returns already validated results
+            response=OCRResponse.model_construct(**outcome),
+            error=None
+        )
+    except HTTPException as e:
+        return BatchItemResponse(
+            filename=image.filename,
+            response=None,
+            error=OCRErrorResponse(
+                error=e.detail,
+                code="VALIDATION_ERROR"
+            )
+        )
+    except Exception as e:
+        logger.error(f"Error processing image {index}: {e}")
+        return BatchItemResponse(
+            filename=image.filename,
+            response=None,
+            error=OCRErrorResponse(
+                error="Processing failed",
+                code="PROCESSING_ERROR"
+            )
+        )
+
+
 @app.post("/extract-text/batch", response_model=BatchResponse)
 async def extract_text_batch(
     request: Request,
@@ -200,46 +292,55 @@ async def extract_text_batch(
     if len(images) > 10:  # Limit batch size
         raise HTTPException(status_code=400, detail="Maximum 10 images per batch")
     
-    results = []
+    # Read and hash every upload first so identical images are processed once
+    uploads = await asyncio.gather(
+        *(read_upload(image) for image in images), return_exceptions=True
+    )
+    unique: Dict[bytes, bytearray] = {}
+    for upload in uploads:
+        if not isinstance(upload, BaseException):
+            content, file_hash = upload
+            unique.setdefault(file_hash, content)
+    
+    # Unique images are processed concurrently on the OCR pool
+    loop = asyncio.get_running_loop()
+    outcomes = await asyncio.gather(
+        *(
+            loop.run_in_executor(ocr_executor, process_image, content, file_hash, start_time)
+            for file_hash, content in unique.items()
+        ),
+        return_exceptions=True
+    )
+    outcome_by_hash = dict(zip(unique, outcomes))
+    for outcome in outcomes:
+        if isinstance(outcome, dict) and not outcome["cached"]:
+            log_ocr_completed(client_ip, outcome)
     
-    for i, image in enumerate(images):
-        try:
-            # Process each image individually
-            result = await extract_text(request, image)
-            results.append(BatchItemResponse(
-                filename=image.filename,
-                response=result,
-                error=None
-            ))
-        except HTTPException as e:
-            results.append(BatchItemResponse(
-                filename=image.filename,
-                response=None,
-                error=OCRErrorResponse(
-                    error=e.detail,
-                    code="VALIDATION_ERROR"
-                )
-            ))
-        except Exception as e:
-            logger.error(f"Error processing image {i}: {e}")
-            results.append(BatchItemResponse(
-                filename=image.filename,
-                response=None,
-                error=OCRErrorResponse(
-                    error="Processing failed",
-                    code="PROCESSING_ERROR"
-                )
-            ))
+    # Fan results back out in upload order; repeats count as cache hits
+    results = []
+    seen = set()
+    for i, (image, upload) in enumerate(zip(images, uploads)):
+        if isinstance(upload, BaseException):
+            outcome = upload
+        else:
+            file_hash = upload[1]
+            outcome = outcome_by_hash[file_hash]
+            if file_hash in seen and isinstance(outcome, dict):
+                outcome = {**outcome, "cached": True}
+            seen.add(file_hash)
+        results.append(build_batch_item(i, image, outcome))
     
     processing_time_ms = int((time.time() - start_time) * 1000)
     
     logger.info(f"Batch processing completed for {client_ip}: {len(images)} images, {processing_time_ms}ms")
     
-    return BatchResponse(
+    # Items are already models, so dump once and skip FastAPI's re-validation
+    response = BatchResponse(
         success=True,
         results=results,
         processing_time_ms=processing_time_ms
     )
+    return ORJSONResponse(content=response.model_dump())
 
 
 @app.get("/cache/stats")
@@ -1,69 +1,83 @@
 import time
 import io
+import os
+import shutil
+import functools
 import logging
+import threading
 from typing import Tuple, Optional, Dict, Any
 import pytesseract
 from PIL import Image
 from .config import settings
+from .utils import describe_image
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
+def _discover_tesseract_paths() -> Tuple[Optional[str], Optional[str]]:
+    """Find the tesseract binary and tessdata directory (probed once per process)"""
+    # Try to find tesseract binary in common locations
+    possible_paths = [
+        "/usr/bin/tesseract",
+        "/usr/local/bin/tesseract",
+        "/nix/store/*/tesseract-*/bin/tesseract",
+        shutil.which("tesseract")
+    ]
+    
+    tesseract_path = None
+    for path in possible_paths:
+        if path and os.path.exists(path):
+            tesseract_path = path
+            break
+    
+    tessdata_paths = [
+        "/usr/share/tesseract-ocr/4.00/tessdata",
+        "/usr/share/tesseract-ocr/5/tessdata", 
+        "/nix/store/*/tesseract-*/share/tessdata"
+    ]
+    
+    tessdata_path = None
+    for path in tessdata_paths:
+        if os.path.exists(path):
+            tessdata_path = path
+            break
+    
+    return tesseract_path, tessdata_path
+
+
 class OCRService:
     def __init__(self):
-        self._check_tesseract()
+        self._tesseract_version_str = self._check_tesseract()
         self._configure_tesseract()
     
-    def _check_tesseract(self):
-        """Check if Tesseract is available"""
+    def _check_tesseract(self) -> str:
+        """Check if Tesseract is available and return its version"""
         try:
-            pytesseract.get_tesseract_version()
+            version = str(pytesseract.get_tesseract_version())
             logger.info("Tesseract OCR initialized successfully")
-            return True
+            return version
         except Exception as e:
             logger.error(f"Tesseract not available: {e}")
             raise RuntimeError("Tesseract OCR is required but not available")
     
     def _configure_tesseract(self):
         """Configure Tesseract paths for Railway deployment"""
-        import os
-        import shutil
-        
-        # Try to find tesseract binary in common locations
-        possible_paths = [
-            "/usr/bin/tesseract",
-            "/usr/local/bin/tesseract",
-            "/nix/store/*/tesseract-*/bin/tesseract",
-            shutil.which("tesseract")
-        ]
-        
-        tesseract_path = None
-        for path in possible_paths:
-            if path and os.path.exists(path):
-                tesseract_path = path
-                break
+        tesseract_path, tessdata_path = _discover_tesseract_paths()
         
         if tesseract_path:
             pytesseract.pytesseract.tesseract_cmd = tesseract_path
             logger.info(f"Tesseract configured at: {tesseract_path}")
         
         # Set tessdata prefix if available
-        tessdata_paths = [
-            "/usr/share/tesseract-ocr/4.00/tessdata",
-            "/usr/share/tesseract-ocr/5/tessdata", 
-            "/nix/store/*/tesseract-*/share/tessdata"
-        ]
-        
-        for path in tessdata_paths:
-            if os.path.exists(path):
-                os.environ['TESSDATA_PREFIX'] = path
-                logger.info(f"Tessdata configured at: {path}")
-                break
+        if tessdata_path:
+            os.environ['TESSDATA_PREFIX'] = tessdata_path
+            logger.info(f"Tessdata configured at: {tessdata_path}")
     
     def extract_text(self, image_content: bytes) -> Tuple[str, float, Dict[str, Any]]:
         """
         Extract text from image using Tesseract OCR
-        Returns: (text, confidence, metadata)
+        Returns: (text, confidence, metadata), metadata including image width/height/format
         """
         start_time = time.time()
         
@@ -71,16 +85,27 @@ class OCRService:
             # Load image with PIL
             image = Image.open(io.BytesIO(image_content))
             
-            # Convert to RGB if necessary
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
+            # Read image metadata now, before conversion drops format details
+            image_metadata = describe_image(image)
+            
+            # Let JPEGs decode straight to grayscale at reduced scale
+            # (no-op for other formats); Tesseract works on grayscale anyway
+            draft_size = settings.ocr_draft_size
+            image.draft('L', (draft_size, draft_size))
+            if image.mode != 'L':
+                image = image.convert('L')
+            scale = image_metadata["width"] / image.width
             
             # Perform OCR with Tesseract
             # Get text and confidence data
-            data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
+            data = pytesseract.image_to_data(
+                image,
+                config=settings.tesseract_config,
+                output_type=pytesseract.Output.DICT
+            )
             
-            # Extract text
-            text = pytesseract.image_to_string(image).strip()
+            # Rebuild the text from the word data instead of running Tesseract twice
+            text = self._reconstruct_text(data)
             
             # Calculate average confidence from word-level confidences
             confidences = [int(conf) for conf in data['conf'] if int(conf) > 0]
@@ -88,6 +113,13 @@ class OCRService:
             
             # Extract metadata
             metadata = self._extract_tesseract_metadata(data, image)
+            metadata.update(image_metadata)
+            
+            # Report bounding boxes in original image coordinates
+            if scale != 1:
+                for box in metadata.get("bounding_boxes", []):
+                    for key in ("x", "y", "width", "height"):
+                        box[key] = round(box[key] * scale)
             
             processing_time = (time.time() - start_time) * 1000
             logger.info(f"OCR completed in {processing_time:.2f}ms, text length: {len(text)}")
@@ -99,36 +131,97 @@ class OCRService:
             raise RuntimeError(f"OCR processing failed: {str(e)}")
     
     
+    @staticmethod
+    def _reconstruct_text(data: Dict) -> str:
+        """Rebuild plain text from image_to_data output, mirroring image_to_string layout"""
+        paragraphs = []
+        lines = []
+        words = []
+        current_line = None
+        current_par = None
+        
+        for block, par, line, word in zip(data['block_num'], data['par_num'], data['line_num'], data['text']):
+            if not word or not word.strip():
+                continue
+            if (block, par, line) != current_line:
+                if words:
+                    lines.append(" ".join(words))
+                    words = []
+                if (block, par) != current_par and lines:
+                    paragraphs.append("\n".join(lines))
+                    lines = []
+                current_line = (block, par, line)
+                current_par = (block, par)
+            words.append(word.strip())
+        
+        if words:
+            lines.append(" ".join(words))
+        if lines:
+            paragraphs.append("\n".join(lines))
+        
+        # Tesseract separates paragraphs with a blank line
+        return "\n\n".join(paragraphs)
+    
     def _extract_tesseract_metadata(self, data: Dict, image: Image.Image) -> Dict[str, Any]:
         """Extract metadata from Tesseract OCR response"""
-        # Count text blocks (words with confidence > 0)
-        text_blocks = [i for i, conf in enumerate(data['conf']) if int(conf) > 0]
+        # Bounding boxes for text blocks (words with confidence > 0), read
+        # column-wise straight from Tesseract's output in a single pass
+        columns = (data[k] for k in ('left', 'top', 'width', 'height', 'text', 'conf'))
+        bounding_boxes = [
+            {
+                "x": left,
+                "y": top,
+                "width": width,
+                "height": height,
+                "text": text,
+                "confidence": int(conf) / 100.0
+            }
+            for left, top, width, height, text, conf in zip(*columns)
+            if int(conf) > 0
+        ]
         
         metadata = {
-            "text_blocks": len(text_blocks),
-            "has_text": len(text_blocks) > 0,
-            "tesseract_version": str(pytesseract.get_tesseract_version())
+            "text_blocks": len(bounding_boxes),
+            "has_text": len(bounding_boxes) > 0,
+            "tesseract_version": self._tesseract_version_str
         }
         
-        if text_blocks:
-            # Get bounding boxes for text blocks
-            bounding_boxes = []
-            for i in text_blocks:
-                if i < len(data['left']):
-                    box = {
-                        "x": data['left'][i],
-                        "y": data['top'][i],
-                        "width": data['width'][i],
-                        "height": data['height'][i],
-                        "text": data['text'][i],
-                        "confidence": int(data['conf'][i]) / 100.0
-                    }
-                    bounding_boxes.append(box)
-            
+        if bounding_boxes:
             metadata["bounding_boxes"] = bounding_boxes
         
         return metadata
 
 
-# Global OCR service instance
-ocr_service = OCRService()
+# Seconds to wait after a failed start before probing Tesseract again
+OCR_SERVICE_RETRY_SECONDS = 30.0
+
+_ocr_service: Optional[OCRService] = None
+_ocr_service_error: Optional[str] = None
+_ocr_service_failed_at = 0.0
+_ocr_service_lock = threading.Lock()
+
+
+def get_ocr_service() -> OCRService:
+    """
+    Get the shared OCR service, creating it on first use
+    A failed start is reported without re-probing Tesseract until the retry backoff elapses
+    """
+    global _ocr_service, _ocr_service_error, _ocr_service_failed_at
+    if _ocr_service is not None:
+        return _ocr_service
+    # Pool threads may race on the first request; build the service once
+    with _ocr_service_lock:
+        if _ocr_service is None:
+            if (
+                _ocr_service_error is not None
+                and time.monotonic() - _ocr_service_failed_at < OCR_SERVICE_RETRY_SECONDS
+            ):
+                raise RuntimeError(_ocr_service_error)
+            try:
+                _ocr_service = OCRService()
+            except RuntimeError as e:
+                _ocr_service_error = str(e)
+                _ocr_service_failed_at = time.monotonic()
+                raise
+            _ocr_service_error = None
+    return _ocr_service
@@ -1,46 +1,77 @@
 import time
-from typing import Dict, Tuple
-from collections import defaultdict, deque
+from typing import Dict, List, Tuple
 import threading
 
 
 class RateLimiter:
+    # Number of independently locked shards; must be a power of two
+    NUM_SHARDS = 16
+
     def __init__(self, max_requests: int = 60, window_seconds: int = 60):
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self.requests: Dict[str, deque] = defaultdict(deque)
-        self.lock = threading.Lock()
-    
+        # Token bucket refill rate: a full bucket per window
+        self.refill_rate = max_requests / window_seconds
+        self._now = time.monotonic
+        # Each shard maps client IP -> [tokens_remaining, last_refill_time]
+        self._shards: List[Tuple[threading.Lock, Dict[str, List[float]]]] = [
+            (threading.Lock(), {}) for _ in range(self.NUM_SHARDS)
+        ]
+        # Drop idle clients every Nth call
+        self._calls = 0
+        self._sweep_every = 1024
+
+    def _shard(self, client_ip: str) -> Tuple[threading.Lock, Dict[str, List[float]]]:
+        """Get the shard responsible for a client"""
+        return self._shards[hash(client_ip) & (self.NUM_SHARDS - 1)]
+
+    def _refilled(self, bucket: List[float], now: float) -> float:
+        """Tokens available in a bucket at the given time"""
+        tokens, last_refill = bucket
+        return min(self.max_requests, tokens + (now - last_refill) * self.refill_rate)
+
     def is_allowed(self, client_ip: str) -> Tuple[bool, int]:
         """Check if request is allowed and return remaining requests"""
-        with self.lock:
-            now = time.time()
-            client_requests = self.requests[client_ip]
-            
-            # Remove old requests outside the window
-            while client_requests and client_requests[0] <= now - self.window_seconds:
-                client_requests.popleft()
-            
-            # Check if under limit
-            if len(client_requests) < self.max_requests:
-                client_requests.append(now)
-                remaining = self.max_requests - len(client_requests)
+        lock, buckets = self._shard(client_ip)
+        with lock:
+            now = self._now()
+
+            # Shared across shards; a lost increment only delays a sweep
+            self._calls += 1
+            if self._calls % self._sweep_every == 0:
+                self._sweep(buckets, now)
+
+            bucket = buckets.get(client_ip)
+            if bucket is None:
+                bucket = buckets[client_ip] = [float(self.max_requests), now]
+            else:
+                bucket[0] = self._refilled(bucket, now)
+                bucket[1] = now
+
+            # Check if a token is available
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                remaining = int(bucket[0])
                 return True, remaining
             else:
                 remaining = 0
                 return False, remaining
-    
+
     def get_remaining(self, client_ip: str) -> int:
         """Get remaining requests for client"""
-        with self.lock:
-            now = time.time()
-            client_requests = self.requests[client_ip]
-            
-            # Remove old requests
-            while client_requests and client_requests[0] <= now - self.window_seconds:
-                client_requests.popleft()
-            
-            return max(0, self.max_requests - len(client_requests))
+        lock, buckets = self._shard(client_ip)
+        with lock:
+            bucket = buckets.get(client_ip)
+            if bucket is None:
+                return self.max_requests
+
+            return int(self._refilled(bucket, self._now()))
+
+    def _sweep(self, buckets: Dict[str, List[float]], now: float) -> None:
+        """Remove clients whose bucket has fully refilled (caller holds the shard lock)"""
+        idle = [ip for ip, bucket in buckets.items() if now - bucket[1] >= self.window_seconds]
+        for ip in idle:
+            del buckets[ip]
 
 
 # Global rate limiter instance
@@ -1,9 +1,13 @@
 import hashlib
-import io
 from typing import Optional, Tuple
 from PIL import Image
 from fastapi import UploadFile
 
+try:
+    from blake3 import blake3
+except ImportError:  # pragma: no cover - blake3 is listed in requirements.txt
+    blake3 = None
+
 
 def validate_image_format(file: UploadFile) -> Tuple[bool, str]:
     """Validate image format and magic bytes"""
@@ -26,41 +30,50 @@ def validate_image_format(file: UploadFile) -> Tuple[bool, str]:
     return True, ""
 
 
+# Image signatures, checked in order with bytes.startswith (no slicing)
+_MAGIC_BYTES = (
+    (b'\xff\xd8', "jpeg"),
+    (b'\x89PNG\r\n\x1a\n', "png"),
+    (b'GIF87a', "gif"),
+    (b'GIF89a', "gif"),
+)
+
+
 def validate_image_magic_bytes(content: bytes) -> Tuple[bool, str]:
     """Validate image magic bytes to prevent spoofing"""
     if len(content) < 4:
         return False, "File too small"
     
-    # JPEG magic bytes
-    if content[:2] == b'\xff\xd8':
-        return True, "jpeg"
-    
-    # PNG magic bytes
-    if content[:8] == b'\x89PNG\r\n\x1a\n':
-        return True, "png"
-    
-    # GIF magic bytes
-    if content[:6] in [b'GIF87a', b'GIF89a']:
-        return True, "gif"
+    for prefix, format_type in _MAGIC_BYTES:
+        if content.startswith(prefix):
+            return True, format_type
     
     return False, "Invalid image format"
 
 
-def get_image_metadata(content: bytes) -> dict:
-    """Extract image metadata using PIL"""
-    try:
-        with Image.open(io.BytesIO(content)) as img:
-            return {
-                "width": img.width,
-                "height": img.height,
-                "format": img.format,
-                "mode": img.mode,
-                "has_transparency": img.mode in ("RGBA", "LA") or "transparency" in img.info
-            }
-    except Exception:
-        return {}
+def describe_image(img: Image.Image) -> dict:
+    """Extract metadata from an already opened PIL image"""
+    return {
+        "width": img.width,
+        "height": img.height,
+        "format": img.format,
+        "mode": img.mode,
+        "has_transparency": img.mode in ("RGBA", "LA") or "transparency" in img.info
+    }
+
+
+# Cache keys are truncated to 16 raw bytes: cheap to hash and store, and
+# collisions are negligible at cache sizes
+FILE_HASH_SIZE = 16
+
+
+def new_file_hasher():
+    """Create an incremental file hasher: BLAKE3, or BLAKE2b if blake3 is missing"""
+    if blake3 is not None:
+        return blake3()
+    return hashlib.blake2b(digest_size=FILE_HASH_SIZE)
 
 
-def calculate_file_hash(content: bytes) -> str:
-    """Calculate SHA-256 hash of file content for caching"""
-    return hashlib.sha256(content).hexdigest()
+def file_hash_digest(hasher) -> bytes:
+    """Finish a hasher from new_file_hasher into a cache key"""
+    return hasher.digest()[:FILE_HASH_SIZE]
@@ -2,84 +2,209 @@
 """
 Create sample test images for OCR testing.
 Run this script to generate test images with known text content.
+
+Set SAMPLE_FMT=PPM to write uncompressed .ppm files instead of JPEGs for
+quick local iteration (the API itself only accepts JPG/PNG/GIF uploads).
+Existing outputs are left alone unless --force is passed.
 """
 
+import argparse
+import multiprocessing
+from functools import lru_cache
 from PIL import Image, ImageDraw, ImageFont
 import os
+import sys
 
-def create_text_image(text, filename, size=(800, 200), bg_color='white', text_color='black'):
-    """Create an image with text for OCR testing."""
-    # Create image
-    img = Image.new('RGB', size, bg_color)
-    draw = ImageDraw.Draw(img)
-    
-    # Try to use a default font, fallback to basic if not available
+# Precomputed RGB values for the colour names used below, so Pillow doesn't
+# parse colour strings on every call (other names/tuples pass through as-is)
+BG = {'white': (255, 255, 255), 'lightgray': (211, 211, 211), 'lightblue': (173, 216, 230)}
+FG = {'black': (0, 0, 0), 'gray': (128, 128, 128), 'blue': (0, 0, 255), 'red': (255, 0, 0)}
+
+# Single-pass baseline JPEG with 4:2:0 chroma subsampling
+JPEG_OPTIONS = dict(quality=85, optimize=False, progressive=False, subsampling=2)
+
+DEJAVU = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+
+
+@lru_cache(maxsize=32)
+def _get_font(path, size):
+    """Load a TrueType font once per (path, size), falling back to PIL's default.
+
+    Pass path=None to use PIL's default font directly.
+    """
+    if path is None:
+        return ImageFont.load_default()
     try:
-        font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 24)
-    except:
-        font = ImageFont.load_default()
-    
-    # Calculate text position (center)
-    bbox = draw.textbbox((0, 0), text, font=font)
+        # Samples are plain ASCII, so skip libraqm's complex text shaping
+        return ImageFont.truetype(path, size, layout_engine=ImageFont.Layout.BASIC)
+    except OSError:
+        return ImageFont.load_default()
+
+
+# Text layout results keyed by (text, font); fonts hash by identity, and the
+# key holds a reference, so an evicted font's id can't be reused for a new one
+_BBOX_CACHE = {}
+
+
+def _text_bbox(text, font):
+    """Measure text once per (text, font) instead of re-running layout."""
+    key = (text, font)
+    bbox = _BBOX_CACHE.get(key)
+    if bbox is None:
+        bbox = ImageDraw.Draw(Image.new('RGB', (1, 1))).textbbox((0, 0), text, font=font)
+        _BBOX_CACHE[key] = bbox
+    return bbox
+
+
+def _use_ppm():
+    return os.environ.get("SAMPLE_FMT", "JPEG").upper() == "PPM"
+
+
+def _output_path(filename):
+    """Path a sample is written to, given the SAMPLE_FMT setting."""
+    if _use_ppm():
+        return os.path.splitext(filename)[0] + ".ppm"
+    return filename
+
+
+def _save_image(img, filename):
+    """Save a sample as JPEG, or as raw PPM when SAMPLE_FMT=PPM; returns the path written."""
+    filename = _output_path(filename)
+    if _use_ppm():
+        img.save(filename, 'PPM')
+    else:
+        img.save(filename, 'JPEG', **JPEG_OPTIONS)
+    return filename
+
+
+def _center_text(text, font, size):
+    """Top-left position that centres text in an image of the given size."""
+    bbox = _text_bbox(text, font)
     text_width = bbox[2] - bbox[0]
     text_height = bbox[3] - bbox[1]
     x = (size[0] - text_width) // 2
     y = (size[1] - text_height) // 2
+    return x, y
+
+
+def create_text_image(text, filename, *, size=(800, 200), bg_color='white', text_color='black',
+                      font_path=DEJAVU, font_size=24, position=None):
+    """Create an image with text for OCR testing; returns the path written.
+
+    Pass position=(x, y) from _layout_samples to skip measuring the text.
+    """
+    bg_color = BG.get(bg_color, bg_color)
+    text_color = FG.get(text_color, text_color)
+    
+    # Create image
+    img = Image.new('RGB', size, bg_color)
+    draw = ImageDraw.Draw(img)
+    
+    # Try to use the requested font, fallback to basic if not available
+    font = _get_font(font_path, font_size)
+    
+    # Calculate text position (center) unless it was precomputed
+    if position is None:
+        position = _center_text(text, font, size)
     
     # Draw text
-    draw.text((x, y), text, fill=text_color, font=font)
+    draw.text(position, text, fill=text_color, font=font)
     
     # Save image
-    img.save(filename, 'JPEG', quality=95)
-    print(f"Created: {filename}")
+    return _save_image(img, filename)
 
 def create_no_text_image(filename, size=(400, 300)):
-    """Create an image without text."""
+    """Create an image without text; returns the path written."""
     # Create a simple gradient image
-    img = Image.new('RGB', size, 'lightblue')
-    draw = ImageDraw.Draw(img)
+    img = Image.new('RGB', size, BG['lightblue'])
     
-    # Draw some shapes (no text)
-    draw.rectangle([50, 50, 350, 250], outline='blue', width=3)
-    draw.ellipse([100, 100, 300, 200], outline='red', width=2)
+    # Draw some shapes (no text); the 3px rectangle outline is four solid
+    # region fills, only the ellipse needs ImageDraw
+    for box in ((50, 50, 351, 53), (50, 248, 351, 251), (50, 50, 53, 251), (348, 50, 351, 251)):
+        img.paste(FG['blue'], box)
+    draw = ImageDraw.Draw(img)
+    draw.ellipse([100, 100, 300, 200], outline=FG['red'], width=2)
     
-    img.save(filename, 'JPEG', quality=95)
-    print(f"Created: {filename}")
+    return _save_image(img, filename)
+
+# Text samples to generate, one entry per image
+SAMPLES = [
+    dict(
+        text="Hello World! This is a test image for OCR.",
+        filename="text_sample.jpg",
+        size=(800, 200),
+    ),
+    dict(
+        text="Document Processing\nMultiple Lines\nOCR Testing",
+        filename="document_sample.jpg",
+        size=(600, 300),
+    ),
+    dict(
+        text="Low Contrast Text",
+        filename="low_contrast.jpg",
+        size=(600, 150),
+        bg_color='lightgray',
+        text_color='gray',
+    ),
+    dict(
+        text="Mixed Content\nText and Graphics",
+        filename="mixed_content.jpg",
+        size=(700, 250),
+    ),
+]
+
 
-def main():
+def _layout_samples(samples):
+    """Return copies of the sample configs with their text positions filled in."""
+    laid_out = []
+    for cfg in samples:
+        font = _get_font(cfg.get("font_path", DEJAVU), cfg.get("font_size", 24))
+        laid_out.append({**cfg, "position": _center_text(cfg["text"], font, cfg["size"])})
+    return laid_out
+
+
+def _render_sample(cfg):
+    """Render one laid-out SAMPLES entry; returns the path written."""
+    return create_text_image(**cfg)
+
+
+NO_TEXT_FILENAME = "no_text.jpg"
+
+
+def main(argv=None):
     """Create all sample test images."""
-    print("Creating sample test images...")
-    
-    # Create images with text
-    create_text_image(
-        "Hello World! This is a test image for OCR.",
-        "text_sample.jpg",
-        size=(800, 200)
-    )
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--force", action="store_true",
+                        help="regenerate images even if they already exist")
+    args = parser.parse_args(argv)
     
-    create_text_image(
-        "Document Processing\nMultiple Lines\nOCR Testing",
-        "document_sample.jpg", 
-        size=(600, 300)
-    )
+    # The images are committed fixtures; only rebuild them when asked to
+    outputs = [_output_path(cfg["filename"]) for cfg in SAMPLES] + [_output_path(NO_TEXT_FILENAME)]
+    if not args.force and all(os.path.exists(path) for path in outputs):
+        print("Sample images already exist; use --force to regenerate them.")
+        return
     
-    create_text_image(
-        "Low Contrast Text",
-        "low_contrast.jpg",
-        size=(600, 150),
-        bg_color='lightgray',
-        text_color='gray'
-    )
+    print("Creating sample test images...")
     
-    create_text_image(
-        "Mixed Content\nText and Graphics",
-        "mixed_content.jpg",
-        size=(700, 250)
-    )
+    # Text layout is computed once up front, so rendering only rasterizes and encodes
+    samples = _layout_samples(SAMPLES)
+
+    # Create images with text. Samples are independent, so with more than one
+    # core they render in separate processes, each warming its own font cache
+    # without contending on the GIL; a single worker would only add process
+    # startup, so render in-process instead
+    processes = min(len(samples), os.cpu_count() or 1)
+    if processes > 1:
+        with multiprocessing.Pool(processes=processes) as pool:
+            created = pool.map(_render_sample, samples)
+    else:
+        created = [_render_sample(cfg) for cfg in samples]
     
     # Create image without text
-    create_no_text_image("no_text.jpg")
+    created.append(create_no_text_image(NO_TEXT_FILENAME))
     
+    # Report all outputs in one write
+    sys.stdout.write("".join(f"Created: {filename}\n" for filename in created))
     print("\n✅ All sample images created successfully!")
     print("You can now test the OCR API with these images.")
 
@@ -1,50 +1,68 @@
 import pytest
+import pytest_asyncio
 import io
-from PIL import Image
-from fastapi.testclient import TestClient
-from app.main import app
 
-client = TestClient(app)
+pytestmark = pytest.mark.asyncio
+
+
+# FastAPI/httpx and PIL are imported inside the fixtures that need them, so
+# collecting or running other test modules doesn't pay for those imports
+
+
+@pytest_asyncio.fixture
+async def aclient():
+    """Async client talking to the app in-process over ASGI"""
+    import httpx
+    from app.main import app
+    
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
 
 
 def create_test_image(format="JPEG", size=(100, 100), text="Test Image"):
     """Create a test image in memory"""
+    from PIL import Image
+    
     img = Image.new('RGB', size, color='white')
     # Add some text-like content
     return img
 
 
-def test_health_check():
+@pytest.fixture(scope="module")
+def jpeg_bytes():
+    """Encode the test image once; tests wrap it in fresh BytesIO objects"""
+    # Stays JPEG to exercise the JPEG path, with the cheapest encoder settings
+    buf = io.BytesIO()
+    create_test_image().save(buf, format='JPEG', quality=1, optimize=False, progressive=False)
+    return buf.getvalue()
+
+
+async def test_health_check(aclient):
     """Test health check endpoint"""
-    response = client.get("/health")
+    response = await aclient.get("/health")
     assert response.status_code == 200
     assert response.json()["status"] == "healthy"
 
 
-def test_extract_text_no_file():
+async def test_extract_text_no_file(aclient):
     """Test extract text without file"""
-    response = client.post("/extract-text")
+    response = await aclient.post("/extract-text")
     assert response.status_code == 422  # Validation error
 
 
-def test_extract_text_invalid_format():
+async def test_extract_text_invalid_format(aclient):
     """Test extract text with invalid file format"""
     # Create a text file instead of image
     files = {"image": ("test.txt", "This is not an image", "text/plain")}
-    response = client.post("/extract-text", files=files)
+    response = await aclient.post("/extract-text", files=files)
     assert response.status_code == 400
 
 
-def test_extract_text_valid_image():
+async def test_extract_text_valid_image(aclient, jpeg_bytes):
     """Test extract text with valid image"""
-    # Create a test JPEG image
-    img = create_test_image()
-    img_bytes = io.BytesIO()
-    img.save(img_bytes, format='JPEG')
-    img_bytes.seek(0)
-    
-    files = {"image": ("test.jpg", img_bytes, "image/jpeg")}
-    response = client.post("/extract-text", files=files)
+    files = {"image": ("test.jpg", io.BytesIO(jpeg_bytes), "image/jpeg")}
+    response = await aclient.post("/extract-text", files=files)
     
     assert response.status_code == 200
     data = response.json()
@@ -58,44 +76,34 @@ def test_extract_text_valid_image():
         assert data["metadata"]["tesseract_version"] is not None
 
 
-def test_batch_processing():
+async def test_batch_processing(aclient, jpeg_bytes):
     """Test batch processing endpoint"""
-    # Create test images
-    img1 = create_test_image()
-    img2 = create_test_image()
-    
-    img1_bytes = io.BytesIO()
-    img1.save(img1_bytes, format='JPEG')
-    img1_bytes.seek(0)
-    
-    img2_bytes = io.BytesIO()
-    img2.save(img2_bytes, format='JPEG')
-    img2_bytes.seek(0)
-    
     files = [
-        ("images", ("test1.jpg", img1_bytes, "image/jpeg")),
-        ("images", ("test2.jpg", img2_bytes, "image/jpeg"))
+        ("images", ("test1.jpg", io.BytesIO(jpeg_bytes), "image/jpeg")),
+        ("images", ("test2.jpg", io.BytesIO(jpeg_bytes), "image/jpeg"))
     ]
     
-    response = client.post("/extract-text/batch", files=files)
+    response = await aclient.post("/extract-text/batch", files=files)
     assert response.status_code == 200
     
     data = response.json()
     assert data["success"] is True
     assert len(data["results"]) == 2
+    # Identical images are processed once and the repeat is served as cached
+    assert data["results"][1]["response"]["cached"] is True
 
 
-def test_cache_stats():
+async def test_cache_stats(aclient):
     """Test cache statistics endpoint"""
-    response = client.get("/cache/stats")
+    response = await aclient.get("/cache/stats")
     assert response.status_code == 200
     data = response.json()
     assert "size" in data
     assert "max_size" in data
 
 
-def test_clear_cache():
+async def test_clear_cache(aclient):
     """Test clear cache endpoint"""
-    response = client.delete("/cache/clear")
+    response = await aclient.delete("/cache/clear")
     assert response.status_code == 200
     assert response.json()["message"] == "Cache cleared successfully"
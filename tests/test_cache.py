@@ -0,0 +1,62 @@
+from app.cache import TTLCache
+
+
+def test_cache_set_and_get():
+    """Test values round-trip through the cache"""
+    cache = TTLCache(max_size=64, ttl_seconds=60)
+    cache.set("a", {"text": "hello"})
+    assert cache.get("a") == {"text": "hello"}
+    assert cache.get("missing") is None
+
+
+def test_cache_size_and_clear():
+    """Test size counts entries across all shards"""
+    cache = TTLCache(max_size=512, ttl_seconds=60)
+    for i in range(100):
+        cache.set(f"key-{i}", i)
+    assert cache.size() == 100
+
+    cache.clear()
+    assert cache.size() == 0
+
+
+def test_cache_evicts_when_full():
+    """Test the cache never grows past max_size"""
+    cache = TTLCache(max_size=32, ttl_seconds=60)
+    for i in range(1000):
+        cache.set(f"key-{i}", i)
+    assert cache.size() <= 32
+
+
+def test_cache_get_refreshes_lru_order():
+    """Test a read moves the entry to the newest position"""
+    class SingleShardCache(TTLCache):
+        NUM_SHARDS = 1
+
+    cache = SingleShardCache(max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_cache_sweeps_expired_entries():
+    """Test periodic sweeps drop expired entries that are never read again"""
+    class SingleShardCache(TTLCache):
+        NUM_SHARDS = 1
+
+    cache = SingleShardCache(max_size=512, ttl_seconds=60)
+    clock = [1000.0]
+    cache._now = lambda: clock[0]
+    for i in range(10):
+        cache.set(f"old-{i}", i)
+
+    clock[0] += 120
+    for i in range(cache._sweep_every - 10):
+        cache.set(f"new-{i}", i)
+
+    assert cache.size() == cache._sweep_every - 10
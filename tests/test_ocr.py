@@ -0,0 +1,131 @@
+import io
+import pytest
+
+
+# app.ocr (which pulls in PIL, pytesseract and, via app.utils, fastapi) is
+# imported inside the tests, so collecting the suite doesn't load it
+
+
+def reconstruct_text(data):
+    """Run OCRService._reconstruct_text on image_to_data style columns"""
+    from app.ocr import OCRService
+    
+    return OCRService._reconstruct_text(data)
+
+
+def make_data(rows):
+    """Build image_to_data style columns from (block, par, line, text) rows"""
+    return {
+        "block_num": [row[0] for row in rows],
+        "par_num": [row[1] for row in rows],
+        "line_num": [row[2] for row in rows],
+        "text": [row[3] for row in rows],
+    }
+
+
+def test_reconstruct_text_single_line():
+    """Test words on one line are joined with spaces"""
+    data = make_data([(1, 1, 1, "Hello"), (1, 1, 1, "OCR"), (1, 1, 1, "World")])
+    assert reconstruct_text(data) == "Hello OCR World"
+
+
+def test_reconstruct_text_line_break_within_paragraph():
+    """Test a new line in the same paragraph starts on the next line"""
+    data = make_data([(1, 1, 1, "first"), (1, 1, 1, "line"), (1, 1, 2, "second")])
+    assert reconstruct_text(data) == "first line\nsecond"
+
+
+def test_reconstruct_text_new_paragraph_and_block():
+    """Test new paragraphs and new blocks are separated by a blank line"""
+    data = make_data([
+        (1, 1, 1, "one"),
+        (1, 2, 1, "two"),
+        (2, 1, 1, "three"),
+    ])
+    assert reconstruct_text(data) == "one\n\ntwo\n\nthree"
+
+
+def test_reconstruct_text_skips_empty_words():
+    """Test empty and whitespace-only rows (page/block/line markers) are ignored"""
+    data = make_data([
+        (0, 0, 0, ""),
+        (1, 0, 0, ""),
+        (1, 1, 1, "kept"),
+        (1, 1, 1, "  "),
+        (1, 1, 2, ""),
+        (1, 1, 3, "also"),
+        (1, 1, 3, "kept"),
+    ])
+    assert reconstruct_text(data) == "kept\nalso kept"
+
+
+def test_reconstruct_text_no_words():
+    """Test data without any words gives empty text"""
+    assert reconstruct_text(make_data([(0, 0, 0, ""), (1, 1, 1, " ")])) == ""
+
+
+def test_extract_text_reports_boxes_in_original_coordinates(monkeypatch):
+    """Test boxes from a draft-decoded large JPEG are scaled back to full size"""
+    import pytesseract
+    from PIL import Image
+    from app.ocr import OCRService
+    
+    buf = io.BytesIO()
+    Image.new("RGB", (4000, 4000), "white").save(buf, format="JPEG", quality=1)
+
+    seen = {}
+
+    def fake_image_to_data(image, config="", output_type=None):
+        seen["size"] = image.size
+        seen["mode"] = image.mode
+        return {
+            "block_num": [1, 1], "par_num": [1, 1], "line_num": [1, 1],
+            "text": ["Hello", "World"], "conf": [90, 80],
+            "left": [10, 60], "top": [20, 20], "width": [40, 45], "height": [15, 15],
+        }
+
+    monkeypatch.setattr(pytesseract, "image_to_data", fake_image_to_data)
+
+    # Skip __init__ so no Tesseract binary is needed
+    service = OCRService.__new__(OCRService)
+    service._tesseract_version_str = "5.3.0"
+    text, confidence, metadata = service.extract_text(buf.getvalue())
+
+    # Tesseract saw the reduced grayscale decode, callers see full-size coordinates
+    assert seen == {"size": (2000, 2000), "mode": "L"}
+    assert text == "Hello World"
+    assert confidence == 0.85
+    assert (metadata["width"], metadata["height"]) == (4000, 4000)
+    assert [(b["x"], b["y"], b["width"], b["height"]) for b in metadata["bounding_boxes"]] == [
+        (20, 40, 80, 30),
+        (120, 40, 90, 30),
+    ]
+
+
+def test_get_ocr_service_retries_after_backoff(monkeypatch):
+    """Test a failed start is reused until the backoff elapses, then retried"""
+    import app.ocr as ocr
+
+    monkeypatch.setattr(ocr, "_ocr_service", None)
+    monkeypatch.setattr(ocr, "_ocr_service_error", None)
+    monkeypatch.setattr(ocr, "_ocr_service_failed_at", 0.0)
+
+    attempts = []
+
+    def failing_service():
+        attempts.append(1)
+        raise RuntimeError("Tesseract OCR is required but not available")
+
+    monkeypatch.setattr(ocr, "OCRService", failing_service)
+    with pytest.raises(RuntimeError):
+        ocr.get_ocr_service()
+    with pytest.raises(RuntimeError):
+        ocr.get_ocr_service()
+    assert len(attempts) == 1
+
+    # Once the backoff has elapsed the next call probes again
+    ocr._ocr_service_failed_at -= ocr.OCR_SERVICE_RETRY_SECONDS
+    service = object()
+    monkeypatch.setattr(ocr, "OCRService", lambda: service)
+    assert ocr.get_ocr_service() is service
+    assert ocr._ocr_service_error is None
@@ -0,0 +1,45 @@
+from app.rate_limit import RateLimiter
+
+
+def test_rate_limiter_allows_up_to_limit():
+    """Test requests are allowed until the limit is reached"""
+    limiter = RateLimiter(max_requests=3, window_seconds=60)
+    assert limiter.is_allowed("1.2.3.4") == (True, 2)
+    assert limiter.is_allowed("1.2.3.4") == (True, 1)
+    assert limiter.is_allowed("1.2.3.4") == (True, 0)
+    assert limiter.is_allowed("1.2.3.4") == (False, 0)
+    assert limiter.get_remaining("1.2.3.4") == 0
+
+
+def test_rate_limiter_tracks_clients_separately():
+    """Test one client's usage does not affect another"""
+    limiter = RateLimiter(max_requests=1, window_seconds=60)
+    assert limiter.is_allowed("1.1.1.1")[0] is True
+    assert limiter.is_allowed("1.1.1.1")[0] is False
+    assert limiter.is_allowed("2.2.2.2")[0] is True
+    assert limiter.get_remaining("3.3.3.3") == 1
+
+
+def test_rate_limiter_refills_over_window():
+    """Test spent tokens come back after a window"""
+    clock = [1000.0]
+    limiter = RateLimiter(max_requests=1, window_seconds=60)
+    limiter._now = lambda: clock[0]
+    assert limiter.is_allowed("1.1.1.1")[0] is True
+    assert limiter.is_allowed("1.1.1.1")[0] is False
+
+    clock[0] += 60
+    assert limiter.is_allowed("1.1.1.1") == (True, 0)
+
+
+def test_rate_limiter_refills_gradually():
+    """Test tokens refill in proportion to elapsed time"""
+    clock = [1000.0]
+    limiter = RateLimiter(max_requests=60, window_seconds=60)
+    limiter._now = lambda: clock[0]
+    for _ in range(60):
+        assert limiter.is_allowed("1.1.1.1")[0] is True
+    assert limiter.is_allowed("1.1.1.1")[0] is False
+
+    clock[0] += 5
+    assert limiter.get_remaining("1.1.1.1") == 5